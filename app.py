@@ -2,8 +2,15 @@ from flask import Flask, render_template, jsonify, request, redirect, url_for, f
 import sqlite3
 import os
 import re
-from datetime import datetime
+import json
+import hashlib
+import click
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from html.parser import HTMLParser
 from werkzeug.utils import secure_filename
+from html_minify import minify_html
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
@@ -21,6 +28,21 @@ app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 if not os.path.exists(UPLOAD_FOLDER):
     os.makedirs(UPLOAD_FOLDER)
 
+# 后台任务配置
+JOB_WORKERS = 2
+JOB_MAX_ATTEMPTS = 3
+JOB_RETRY_DELAY = 5  # 秒，第 n 次重试等待 n * JOB_RETRY_DELAY
+# 秒，超过该时间未更新的任务视为执行它的进程已退出；每隔 JOB_STALE_TIMEOUT / 2 检查一次，
+# 因此进程崩溃后其 running 任务最长约 1.5 * JOB_STALE_TIMEOUT（15分钟）后才会重试
+JOB_STALE_TIMEOUT = 600
+
+# 上传后生成压缩版本（原文件保留用于下载和编辑）
+app.config['OPTIMIZE_UPLOADS'] = True
+
+# 静态导出配置（导出目录可直接由 nginx/CDN 提供）
+app.config['EXPORT_FOLDER'] = 'static_export'
+EXPORT_PER_PAGE = 10  # 与 /api/tools 默认分页一致
+
 def get_db_connection():
     """获取数据库连接"""
     conn = sqlite3.connect(DATABASE)
@@ -80,9 +102,334 @@ def init_db():
         )
     ''')
     
+    # 上传组件的派生字段，由后台任务异步填充
+    ensure_column(conn, 'uploaded_components', 'description', 'TEXT')
+    ensure_column(conn, 'uploaded_components', 'file_size', 'INTEGER')
+    ensure_column(conn, 'uploaded_components', 'file_hash', 'TEXT')
+    ensure_column(conn, 'uploaded_components', 'process_status', "TEXT NOT NULL DEFAULT 'pending'")
+    ensure_column(conn, 'uploaded_components', 'processed_at', 'TEXT')
+    ensure_column(conn, 'uploaded_components', 'optimized_file_name', 'TEXT')
+    ensure_column(conn, 'uploaded_components', 'original_size', 'INTEGER')
+    ensure_column(conn, 'uploaded_components', 'optimized_size', 'INTEGER')
+    
+    # 创建后台任务表
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_type TEXT NOT NULL,
+            component_id INTEGER NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_component ON jobs (component_id)')
+    
+    # 创建变更日志表，供静态导出增量更新
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS change_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            entity TEXT NOT NULL,
+            entity_id INTEGER NOT NULL,
+            category_id INTEGER,
+            changed_at TEXT NOT NULL
+        )
+    ''')
+    
     conn.commit()
     conn.close()
 
+def ensure_column(conn, table, column, definition):
+    """为已存在的表补充缺失的字段（旧数据库升级用）"""
+    columns = [row['name'] for row in conn.execute(f'PRAGMA table_info({table})').fetchall()]
+    if column not in columns:
+        conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+
+def log_change(conn, entity, entity_id, *category_ids):
+    """记录数据变更（entity 为 category/tool/component），每个受影响的分类一条"""
+    for category_id in set(category_ids):
+        conn.execute('''
+            INSERT INTO change_log (entity, entity_id, category_id, changed_at)
+            VALUES (?, ?, ?, ?)
+        ''', (entity, entity_id, category_id, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+
+# ==================== 后台任务 ====================
+
+class ComponentMetaParser(HTMLParser):
+    """提取HTML中的 <title> 和 meta description"""
+    
+    def __init__(self):
+        super().__init__()
+        self.title = ''
+        self.description = ''
+        self._in_title = False
+    
+    def handle_starttag(self, tag, attrs):
+        if tag == 'title':
+            self._in_title = True
+        elif tag == 'meta':
+            attrs = dict(attrs)
+            if (attrs.get('name') or '').lower() == 'description' and not self.description:
+                self.description = (attrs.get('content') or '').strip()
+    
+    def handle_endtag(self, tag):
+        if tag == 'title':
+            self._in_title = False
+    
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+
+def process_component(conn, component):
+    """计算文件大小、哈希，并提取标题/描述用于搜索"""
+    file_path = os.path.join(app.config['UPLOAD_FOLDER'], component['file_name'])
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    
+    parser = ComponentMetaParser()
+    parser.feed(data.decode('utf-8', errors='replace'))
+    parser.close()
+    description = parser.description or parser.title.strip() or component['title']
+    
+    conn.execute('''
+        UPDATE uploaded_components SET description = ?, file_size = ?, file_hash = ?
+        WHERE id = ?
+    ''', (description, len(data), hashlib.sha256(data).hexdigest(), component['id']))
+    log_change(conn, 'component', component['id'], component['category_id'])
+
+def optimized_file_name(file_name):
+    """压缩版本的文件名，如 demo.html -> demo.min.html"""
+    return file_name.rsplit('.', 1)[0] + '.min.html'
+
+def optimize_component(conn, component):
+    """压缩HTML及内联CSS/JS，另存为压缩版本并记录前后大小"""
+    file_path = os.path.join(app.config['UPLOAD_FOLDER'], component['file_name'])
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    
+    try:
+        html = data.decode('utf-8')
+    except UnicodeDecodeError:
+        # 非UTF-8文件不做压缩，直接提供原文件
+        html = None
+    
+    optimized = minify_html(html).encode('utf-8') if html is not None else data
+    optimized_name = optimized_file_name(component['file_name'])
+    optimized_path = os.path.join(app.config['UPLOAD_FOLDER'], optimized_name)
+    
+    if len(optimized) < len(data):
+        with open(optimized_path, 'wb') as f:
+            f.write(optimized)
+        
+        # 执行期间组件可能已被删除，其文件已清理，这里写入的压缩文件也要删除
+        exists = conn.execute('SELECT id FROM uploaded_components WHERE id = ?', (component['id'],)).fetchone()
+        if not exists:
+            os.remove(optimized_path)
+            return
+    else:
+        optimized_name = None
+        if os.path.exists(optimized_path):
+            os.remove(optimized_path)
+    
+    conn.execute('''
+        UPDATE uploaded_components SET optimized_file_name = ?, original_size = ?, optimized_size = ?
+        WHERE id = ?
+    ''', (optimized_name, len(data), len(optimized) if optimized_name else len(data), component['id']))
+    log_change(conn, 'component', component['id'], component['category_id'])
+
+# 任务类型 -> 处理函数，处理函数接收 (conn, component)
+JOB_HANDLERS = {
+    'process': process_component,
+    'optimize': optimize_component,
+}
+
+job_executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix='job')
+job_workers_started = False
+job_workers_lock = threading.Lock()
+
+def now_str():
+    """当前时间字符串"""
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+def enqueue_job(conn, job_type, component_id):
+    """写入任务表，提交事务后需调用 dispatch_job 执行"""
+    cursor = conn.execute('''
+        INSERT INTO jobs (job_type, component_id, status, created_at, updated_at)
+        VALUES (?, ?, 'pending', ?, ?)
+    ''', (job_type, component_id, now_str(), now_str()))
+    return cursor.lastrowid
+
+def dispatch_job(job_id, delay=0):
+    """将任务交给线程池执行，可选延迟（用于重试）"""
+    if delay:
+        timer = threading.Timer(delay, dispatch_job, args=(job_id,))
+        timer.daemon = True
+        timer.start()
+    else:
+        job_executor.submit(run_job, job_id)
+
+def update_process_status(conn, component_id):
+    """根据组件每种任务的最近一次执行汇总处理状态"""
+    statuses = {row['status'] for row in conn.execute('''
+        SELECT status FROM jobs WHERE id IN (
+            SELECT MAX(id) FROM jobs WHERE component_id = ? GROUP BY job_type
+        )
+    ''', (component_id,)).fetchall()}
+    
+    if 'failed' in statuses:
+        status = 'failed'
+    elif 'running' in statuses:
+        status = 'processing'
+    elif 'pending' in statuses:
+        status = 'pending'
+    else:
+        status = 'done'
+    
+    conn.execute('''
+        UPDATE uploaded_components SET process_status = ?, processed_at = ?
+        WHERE id = ?
+    ''', (status, now_str() if status == 'done' else None, component_id))
+
+def run_job(job_id):
+    """执行单个任务，失败时按次数重试"""
+    conn = get_db_connection()
+    try:
+        # 原子地抢占任务，防止同一任务被重复执行
+        claimed = conn.execute('''
+            UPDATE jobs SET status = 'running', attempts = attempts + 1, updated_at = ?
+            WHERE id = ? AND status = 'pending'
+        ''', (now_str(), job_id)).rowcount
+        if not claimed:
+            conn.commit()
+            return
+        
+        job = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        update_process_status(conn, job['component_id'])
+        conn.commit()
+        
+        component = conn.execute(
+            'SELECT * FROM uploaded_components WHERE id = ?',
+            (job['component_id'],)
+        ).fetchone()
+        
+        try:
+            # 组件已被删除时直接结束任务
+            if component:
+                JOB_HANDLERS[job['job_type']](conn, component)
+        except Exception as e:
+            conn.rollback()
+            retry = job['attempts'] < JOB_MAX_ATTEMPTS
+            conn.execute('''
+                UPDATE jobs SET status = ?, last_error = ?, updated_at = ?
+                WHERE id = ?
+            ''', ('pending' if retry else 'failed', str(e), now_str(), job_id))
+            update_process_status(conn, job['component_id'])
+            conn.commit()
+            if retry:
+                dispatch_job(job_id, delay=job['attempts'] * JOB_RETRY_DELAY)
+            return
+        
+        conn.execute('''
+            UPDATE jobs SET status = 'done', last_error = NULL, updated_at = ?
+            WHERE id = ?
+        ''', (now_str(), job_id))
+        update_process_status(conn, job['component_id'])
+        conn.commit()
+    except Exception as e:
+        app.logger.exception('任务 %s 执行异常：%s', job_id, e)
+    finally:
+        conn.close()
+
+def reclaim_stale_jobs(conn):
+    """回收已无进程处理的任务并重新排队，返回需要派发的任务"""
+    cutoff = (datetime.now() - timedelta(seconds=JOB_STALE_TIMEOUT)).strftime('%Y-%m-%d %H:%M:%S')
+    # 只回收超时的任务，其他进程仍在执行的任务不受影响；
+    # 超时仍未执行的 pending 任务说明登记它的进程未能派发
+    stale = conn.execute('''
+        SELECT * FROM jobs WHERE status IN ('running', 'pending') AND updated_at < ? ORDER BY id
+    ''', (cutoff,)).fetchall()
+    
+    job_ids = []
+    for job in stale:
+        # 任务可能导致进程崩溃（内存不足等），次数用完后不再重试
+        failed = job['status'] == 'running' and job['attempts'] >= JOB_MAX_ATTEMPTS
+        reclaimed = conn.execute('''
+            UPDATE jobs SET status = ?, last_error = COALESCE(?, last_error), updated_at = ?
+            WHERE id = ? AND updated_at < ?
+        ''', ('failed' if failed else 'pending', '执行超时或进程异常退出' if failed else None,
+              now_str(), job['id'], cutoff)).rowcount
+        if not reclaimed:
+            continue
+        if failed:
+            update_process_status(conn, job['component_id'])
+        else:
+            job_ids.append(job['id'])
+    return job_ids
+
+def sweep_stale_jobs():
+    """定期回收并派发无人处理的任务"""
+    try:
+        conn = get_db_connection()
+        try:
+            job_ids = reclaim_stale_jobs(conn)
+            conn.commit()
+        finally:
+            conn.close()
+        for job_id in job_ids:
+            dispatch_job(job_id)
+    except Exception as e:
+        app.logger.exception('回收任务异常：%s', e)
+    finally:
+        timer = threading.Timer(JOB_STALE_TIMEOUT / 2, sweep_stale_jobs)
+        timer.daemon = True
+        timer.start()
+
+def start_job_workers():
+    """初始化数据库，派发未完成的任务并启动定期回收"""
+    global job_workers_started
+    with job_workers_lock:
+        if job_workers_started:
+            return
+        
+        # 旧数据库需要先补充任务表和新增字段
+        init_db()
+        
+        conn = get_db_connection()
+        try:
+            reclaim_stale_jobs(conn)
+            # 任务表引入前上传的组件补登记处理任务
+            job_types = ['process', 'optimize'] if app.config['OPTIMIZE_UPLOADS'] else ['process']
+            for job_type in job_types:
+                legacy = conn.execute('''
+                    SELECT id FROM uploaded_components
+                    WHERE id NOT IN (SELECT component_id FROM jobs WHERE job_type = ?)
+                ''', (job_type,)).fetchall()
+                for row in legacy:
+                    enqueue_job(conn, job_type, row['id'])
+            conn.commit()
+            pending = conn.execute("SELECT id FROM jobs WHERE status = 'pending' ORDER BY id").fetchall()
+        finally:
+            conn.close()
+        
+        # 数据库准备完成后才标记启动，失败时下一个请求会重试
+        job_workers_started = True
+    
+    for row in pending:
+        dispatch_job(row['id'])
+    
+    timer = threading.Timer(JOB_STALE_TIMEOUT / 2, sweep_stale_jobs)
+    timer.daemon = True
+    timer.start()
+
+@app.before_request
+def ensure_job_workers():
+    """在处理请求的进程中启动后台任务（避免 reloader 父进程重复执行）"""
+    if not job_workers_started:
+        start_job_workers()
+
 @app.route('/')
 def index():
     """主页"""
@@ -97,16 +444,8 @@ def get_categories():
     
     return jsonify([dict(row) for row in categories])
 
-@app.route('/api/tools')
-def get_tools():
-    """获取工具列表（包含预设工具和上传组件），支持分页和搜索"""
-    category_id = request.args.get('category_id')
-    search = request.args.get('search', '').strip()
-    page = int(request.args.get('page', 1))
-    per_page = int(request.args.get('per_page', 10))
-    
-    conn = get_db_connection()
-    
+def query_tools(conn, category_id=None, search=''):
+    """查询工具列表（包含预设工具和上传组件），按发布日期倒序"""
     # 构建基础查询条件
     where_conditions = []
     params = []
@@ -142,7 +481,7 @@ def get_tools():
     
     # 获取上传组件
     uploaded_query = '''
-        SELECT uc.id, uc.title as name, uc.title as description, uc.path_name as url, uc.category_id, uc.upload_date as publish_date, c.display_name as category_name, 'uploaded' as source_type
+        SELECT uc.id, uc.title as name, COALESCE(uc.description, uc.title) as description, uc.path_name as url, uc.category_id, uc.upload_date as publish_date, c.display_name as category_name, 'uploaded' as source_type
         FROM uploaded_components uc 
         JOIN categories c ON uc.category_id = c.id 
     '''
@@ -154,9 +493,9 @@ def get_tools():
     
     if search:
         if uploaded_params:
-            uploaded_query += ' AND (uc.title LIKE ? OR uc.title LIKE ?)'
+            uploaded_query += ' AND (uc.title LIKE ? OR uc.description LIKE ?)'
         else:
-            uploaded_query += ' WHERE (uc.title LIKE ? OR uc.title LIKE ?)'
+            uploaded_query += ' WHERE (uc.title LIKE ? OR uc.description LIKE ?)'
         uploaded_params.extend([f'%{search}%', f'%{search}%'])
     
     uploaded = conn.execute(uploaded_query, uploaded_params).fetchall()
@@ -166,17 +505,16 @@ def get_tools():
     
     # 按发布日期排序
     all_tools.sort(key=lambda x: x['publish_date'], reverse=True)
-    
-    # 计算分页
+    return all_tools
+
+def paginate_tools(all_tools, page, per_page):
+    """对工具列表分页，返回 /api/tools 的响应结构"""
     total = len(all_tools)
     start = (page - 1) * per_page
     end = start + per_page
-    paginated_tools = all_tools[start:end]
     
-    conn.close()
-    
-    return jsonify({
-        'tools': paginated_tools,
+    return {
+        'tools': all_tools[start:end],
         'pagination': {
             'page': page,
             'per_page': per_page,
@@ -185,7 +523,21 @@ def get_tools():
             'has_prev': page > 1,
             'has_next': page * per_page < total
         }
-    })
+    }
+
+@app.route('/api/tools')
+def get_tools():
+    """获取工具列表（包含预设工具和上传组件），支持分页和搜索"""
+    category_id = request.args.get('category_id')
+    search = request.args.get('search', '').strip()
+    page = int(request.args.get('page', 1))
+    per_page = int(request.args.get('per_page', 10))
+    
+    conn = get_db_connection()
+    all_tools = query_tools(conn, category_id, search)
+    conn.close()
+    
+    return jsonify(paginate_tools(all_tools, page, per_page))
 
 @app.route('/upload')
 def upload_page():
@@ -232,19 +584,29 @@ def upload_component():
         file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
         file.save(file_path)
         
-        # 保存到数据库
+        # 保存到数据库，并登记后台处理任务
         conn = get_db_connection()
-        conn.execute('''
+        cursor = conn.execute('''
             INSERT INTO uploaded_components (title, path_name, file_name, category_id, upload_date)
             VALUES (?, ?, ?, ?, ?)
         ''', (title, path_name, filename, category_id, datetime.now().strftime('%Y-%m-%d')))
+        component_id = cursor.lastrowid
+        log_change(conn, 'component', component_id, category_id)
+        job_ids = [enqueue_job(conn, 'process', component_id)]
+        if app.config['OPTIMIZE_UPLOADS']:
+            job_ids.append(enqueue_job(conn, 'optimize', component_id))
         conn.commit()
         conn.close()
         
+        for job_id in job_ids:
+            dispatch_job(job_id)
+        
         return jsonify({
             'success': True, 
             'message': '上传成功！',
-            'access_url': f'/{path_name}'
+            'access_url': f'/{path_name}',
+            'component_id': component_id,
+            'process_status': 'pending'
         })
         
     except Exception as e:
@@ -268,12 +630,33 @@ def serve_component(path_name):
     if not component:
         return "组件不存在", 404
     
+    # 开启压缩时默认返回压缩版本，?original=1 返回原文件
+    file_name = component['file_name']
+    if (app.config['OPTIMIZE_UPLOADS'] and component['optimized_file_name']
+            and request.args.get('original') != '1'):
+        file_name = component['optimized_file_name']
+    
     # 返回HTML文件
     try:
-        return send_from_directory(app.config['UPLOAD_FOLDER'], component['file_name'])
+        return send_from_directory(app.config['UPLOAD_FOLDER'], file_name)
     except FileNotFoundError:
         return "文件不存在", 404
 
+@app.route('/api/uploaded-components/<int:component_id>/download')
+def download_component(component_id):
+    """下载上传组件的原始文件"""
+    conn = get_db_connection()
+    component = conn.execute(
+        'SELECT * FROM uploaded_components WHERE id = ?', 
+        (component_id,)
+    ).fetchone()
+    conn.close()
+    
+    if not component:
+        return jsonify({'success': False, 'message': '组件不存在'}), 404
+    
+    return send_from_directory(app.config['UPLOAD_FOLDER'], component['file_name'], as_attachment=True)
+
 @app.route('/api/uploaded-components')
 def get_uploaded_components():
     """获取上传组件列表"""
@@ -302,6 +685,30 @@ def get_uploaded_components():
     
     return jsonify([dict(row) for row in components])
 
+@app.route('/api/uploaded-components/<int:component_id>/status')
+def get_component_status(component_id):
+    """获取上传组件的后台处理状态"""
+    conn = get_db_connection()
+    component = conn.execute('''
+        SELECT id, title, description, file_size, file_hash, process_status, processed_at,
+               optimized_file_name, original_size, optimized_size
+        FROM uploaded_components WHERE id = ?
+    ''', (component_id,)).fetchone()
+    
+    if not component:
+        conn.close()
+        return jsonify({'success': False, 'message': '组件不存在'}), 404
+    
+    jobs = conn.execute('''
+        SELECT id, job_type, status, attempts, last_error, created_at, updated_at
+        FROM jobs WHERE component_id = ? ORDER BY id
+    ''', (component_id,)).fetchall()
+    conn.close()
+    
+    result = dict(component)
+    result['jobs'] = [dict(row) for row in jobs]
+    return jsonify(result)
+
 @app.route('/api/uploaded-components/<int:component_id>', methods=['DELETE'])
 def delete_uploaded_component(component_id):
     """删除上传的组件"""
@@ -318,15 +725,20 @@ def delete_uploaded_component(component_id):
             conn.close()
             return jsonify({'success': False, 'message': '组件不存在'}), 404
         
-        # 删除数据库记录
+        # 删除数据库记录及其后台任务
         conn.execute('DELETE FROM uploaded_components WHERE id = ?', (component_id,))
+        conn.execute('DELETE FROM jobs WHERE component_id = ?', (component_id,))
+        log_change(conn, 'component', component_id, component['category_id'])
         conn.commit()
         conn.close()
         
-        # 删除文件
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], component['file_name'])
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        # 删除文件（包括压缩版本）
+        for file_name in (component['file_name'], component['optimized_file_name']):
+            if not file_name:
+                continue
+            file_path = os.path.join(app.config['UPLOAD_FOLDER'], file_name)
+            if os.path.exists(file_path):
+                os.remove(file_path)
         
         return jsonify({
             'success': True, 
@@ -363,6 +775,7 @@ def create_category():
         # 插入新分类
         cursor = conn.execute('INSERT INTO categories (name, display_name) VALUES (?, ?)', (name, display_name))
         category_id = cursor.lastrowid
+        log_change(conn, 'category', category_id, category_id)
         conn.commit()
         conn.close()
         
@@ -406,6 +819,7 @@ def update_category(category_id):
         
         # 更新分类
         conn.execute('UPDATE categories SET name = ?, display_name = ? WHERE id = ?', (name, display_name, category_id))
+        log_change(conn, 'category', category_id, category_id)
         conn.commit()
         conn.close()
         
@@ -440,6 +854,7 @@ def delete_category(category_id):
         
         # 删除分类
         conn.execute('DELETE FROM categories WHERE id = ?', (category_id,))
+        log_change(conn, 'category', category_id, category_id)
         conn.commit()
         conn.close()
         
@@ -514,6 +929,7 @@ def create_preset_tool():
         ''', (title, description, category_id, publish_date))
         
         tool_id = cursor.lastrowid
+        log_change(conn, 'tool', tool_id, category_id)
         conn.commit()
         conn.close()
         
@@ -566,6 +982,8 @@ def update_preset_tool(tool_id):
             UPDATE tools SET title = ?, description = ?, category_id = ? 
             WHERE id = ?
         ''', (title, description, category_id, tool_id))
+        # 分类变更时新旧分类都受影响
+        log_change(conn, 'tool', tool_id, tool['category_id'], category_id)
         
         conn.commit()
         conn.close()
@@ -598,6 +1016,7 @@ def delete_preset_tool(tool_id):
         
         # 删除工具
         conn.execute('DELETE FROM tools WHERE id = ?', (tool_id,))
+        log_change(conn, 'tool', tool_id, tool['category_id'])
         conn.commit()
         conn.close()
         
@@ -609,10 +1028,220 @@ def delete_preset_tool(tool_id):
     except Exception as e:
         return jsonify({'success': False, 'message': f'删除失败：{str(e)}'}), 500
 
+# ==================== 静态导出 ====================
+
+export_lock = threading.Lock()
+
+def export_json(data):
+    """序列化导出数据"""
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+def write_export_file(output_dir, rel_path, data):
+    """原子写入导出文件，避免CDN读到写了一半的文件"""
+    path = os.path.join(output_dir, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def remove_export_file(output_dir, rel_path):
+    """删除过期的导出文件"""
+    path = os.path.join(output_dir, rel_path)
+    if os.path.exists(path):
+        os.remove(path)
+
+def export_tool_pages(conn, output_dir, category_id, component_files):
+    """导出某分类（0表示全部）的所有分页，返回文件列表；
+    上传组件的 url 改为导出后的哈希文件路径，前端按 /<url> 访问即可"""
+    # 文件缺失的上传组件在静态目录中无法访问，不放进列表
+    all_tools = [tool for tool in query_tools(conn, category_id)
+                 if tool['source_type'] != 'uploaded' or tool['url'] in component_files]
+    for tool in all_tools:
+        if tool['source_type'] == 'uploaded':
+            tool['url'] = component_files[tool['url']]
+    pages = max(1, (len(all_tools) + EXPORT_PER_PAGE - 1) // EXPORT_PER_PAGE)
+    
+    files = []
+    for page in range(1, pages + 1):
+        rel_path = f'tools/{category_id}/page-{page}.json'
+        write_export_file(output_dir, rel_path, export_json(paginate_tools(all_tools, page, EXPORT_PER_PAGE)))
+        files.append(rel_path)
+    return files
+
+def export_component_file(conn, output_dir, component_id):
+    """以内容哈希命名导出组件文件（优先压缩版本），组件不存在时返回 None"""
+    component = conn.execute(
+        'SELECT * FROM uploaded_components WHERE id = ?',
+        (component_id,)
+    ).fetchone()
+    if not component:
+        return None
+    
+    # 与 serve_component 保持一致
+    file_name = component['file_name']
+    if app.config['OPTIMIZE_UPLOADS'] and component['optimized_file_name']:
+        file_name = component['optimized_file_name']
+    try:
+        with open(os.path.join(app.config['UPLOAD_FOLDER'], file_name), 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    
+    file_hash = hashlib.sha256(data).hexdigest()
+    rel_path = f"components/{component['path_name']}.{file_hash[:12]}.html"
+    write_export_file(output_dir, rel_path, data)
+    return {'path_name': component['path_name'], 'file': rel_path, 'hash': file_hash}
+
+def export_static(output_dir, full=False):
+    """将分类、工具分页和组件文件导出为静态目录，默认只重新生成变更涉及的部分"""
+    with export_lock:
+        manifest_path = os.path.join(output_dir, 'manifest.json')
+        old_manifest = None
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding='utf-8') as f:
+                old_manifest = json.load(f)
+        
+        incremental = (not full and old_manifest is not None
+                       and old_manifest.get('per_page') == EXPORT_PER_PAGE)
+        
+        conn = get_db_connection()
+        try:
+            # 先记下变更位置再读数据，导出期间发生的变更留给下一次导出
+            last_change = conn.execute('SELECT id, changed_at FROM change_log ORDER BY id DESC LIMIT 1').fetchone()
+            last_change_id = last_change['id'] if last_change else 0
+            last_change_at = last_change['changed_at'] if last_change else None
+            
+            # 清单记录的变更已不在日志中（已被清理，或数据库重建后编号重新开始）时只能全量重建
+            if incremental:
+                previous = conn.execute(
+                    'SELECT changed_at FROM change_log WHERE id = ?',
+                    (old_manifest['last_change_id'],)
+                ).fetchone()
+                if not previous or previous['changed_at'] != old_manifest.get('last_change_at'):
+                    incremental = False
+            
+            categories = [dict(row) for row in conn.execute('SELECT * FROM categories ORDER BY id').fetchall()]
+            category_ids = ['0'] + [str(category['id']) for category in categories]
+            
+            if incremental:
+                changes = conn.execute(
+                    'SELECT * FROM change_log WHERE id > ?',
+                    (old_manifest['last_change_id'],)
+                ).fetchall()
+                manifest = {
+                    'tools': dict(old_manifest['tools']),
+                    'components': dict(old_manifest['components']),
+                }
+                export_categories = any(change['entity'] == 'category' for change in changes)
+                # 任何变更都会影响“全部”分类的分页
+                dirty_categories = {'0'} if changes else set()
+                dirty_categories |= {str(change['category_id']) for change in changes
+                                     if change['category_id'] is not None}
+                dirty_components = {str(change['entity_id']) for change in changes
+                                    if change['entity'] == 'component'}
+            else:
+                manifest = {'tools': {}, 'components': {}}
+                export_categories = True
+                dirty_categories = set(category_ids)
+                dirty_components = {str(row['id']) for row in conn.execute(
+                    'SELECT id FROM uploaded_components'
+                ).fetchall()}
+            
+            written = []
+            if export_categories:
+                write_export_file(output_dir, 'categories.json', export_json(categories))
+                written.append('categories.json')
+            
+            # 先导出组件文件，分页中需要引用它们的哈希文件名
+            for component_id in sorted(dirty_components):
+                entry = export_component_file(conn, output_dir, component_id)
+                if entry:
+                    manifest['components'][component_id] = entry
+                    written.append(entry['file'])
+                else:
+                    manifest['components'].pop(component_id, None)
+            
+            component_files = {entry['path_name']: entry['file'] for entry in manifest['components'].values()}
+            missing_components = sorted(
+                row['path_name'] for row in conn.execute('SELECT path_name FROM uploaded_components').fetchall()
+                if row['path_name'] not in component_files
+            )
+            for category_id in sorted(dirty_categories):
+                if category_id in category_ids:
+                    manifest['tools'][category_id] = export_tool_pages(conn, output_dir, category_id, component_files)
+                    written.extend(manifest['tools'][category_id])
+                else:
+                    manifest['tools'].pop(category_id, None)
+        finally:
+            conn.close()
+        
+        manifest.update({
+            'generated_at': now_str(),
+            'last_change_id': last_change_id,
+            'last_change_at': last_change_at,
+            'missing_components': missing_components,
+            'per_page': EXPORT_PER_PAGE,
+            'categories': 'categories.json',
+        })
+        write_export_file(output_dir, 'manifest.json', export_json(manifest))
+        
+        # 清理上一版清单中已不再使用的文件
+        removed = []
+        if old_manifest is not None:
+            def manifest_files(m):
+                files = {m['categories']}
+                for pages in m['tools'].values():
+                    files.update(pages)
+                files.update(entry['file'] for entry in m['components'].values())
+                return files
+            
+            removed = sorted(manifest_files(old_manifest) - manifest_files(manifest))
+            for rel_path in removed:
+                remove_export_file(output_dir, rel_path)
+        
+        # 已导出的变更不再需要；保留最后一条，供下次导出核对清单
+        conn = get_db_connection()
+        conn.execute('DELETE FROM change_log WHERE id < ?', (last_change_id,))
+        conn.commit()
+        conn.close()
+        
+        return {
+            'full': not incremental,
+            'written': len(written),
+            'removed': len(removed),
+            'missing_components': missing_components,
+            'last_change_id': last_change_id,
+        }
+
+@app.route('/api/export', methods=['POST'])
+def export_catalog():
+    """导出静态目录，?full=1 时全量重建"""
+    try:
+        result = export_static(app.config['EXPORT_FOLDER'], full=request.args.get('full') == '1')
+        message = '导出完成'
+        if result['missing_components']:
+            message += f"，{len(result['missing_components'])} 个组件文件缺失未导出"
+        return jsonify({'success': True, 'message': message, **result})
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'导出失败：{str(e)}'}), 500
+
+@app.cli.command('export-static')
+@click.option('--output', default=None, help='导出目录，默认为 EXPORT_FOLDER')
+@click.option('--full', is_flag=True, help='忽略变更日志，全量重建')
+def export_static_command(output, full):
+    """导出静态目录：flask --app app export-static"""
+    init_db()
+    result = export_static(output or app.config['EXPORT_FOLDER'], full=full)
+    click.echo(f"导出完成：写入 {result['written']} 个文件，删除 {result['removed']} 个文件")
+    if result['missing_components']:
+        click.echo(f"以下组件文件缺失，未导出：{', '.join(result['missing_components'])}", err=True)
+
 if __name__ == '__main__':
-    # 初始化数据库
-    if not os.path.exists(DATABASE):
-        init_db()
+    # 初始化数据库（已存在时补充新增的表和字段）
+    is_new_db = not os.path.exists(DATABASE)
+    init_db()
+    if is_new_db:
         print("数据库初始化完成")
     
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
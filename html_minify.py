@@ -0,0 +1,310 @@
+import re
+
+# HTML/CSS 的空白只有这几个ASCII字符；\xa0、全角空格 \u3000 等会被渲染，不能合并
+SPACE_CHARS = ' \t\n\r\f'
+WHITESPACE_PATTERN = re.compile(f'[{SPACE_CHARS}]+')
+
+# 按文档顺序识别注释和标签；引号内的 > 属于属性值，不结束标签
+HTML_TOKEN_PATTERN = re.compile(
+    r'<!--.*?-->|<[!/?a-zA-Z](?:[^>"\']|"[^"]*"|\'[^\']*\')*>',
+    re.DOTALL
+)
+TAG_NAME_PATTERN = re.compile(r'</?([a-zA-Z0-9!][a-zA-Z0-9:-]*)')
+
+# 内容需要原样保留或单独处理的标签
+RAW_TAGS = {'pre', 'textarea', 'script', 'style'}
+
+# 块级及不参与渲染的标签，它们之间的纯空白可以安全删除
+BLOCK_TAGS = {
+    '!doctype', 'html', 'head', 'body', 'meta', 'link', 'title', 'base', 'style',
+    'div', 'p', 'ul', 'ol', 'li', 'dl', 'dt', 'dd', 'table', 'thead', 'tbody',
+    'tfoot', 'tr', 'td', 'th', 'caption', 'section', 'article', 'header',
+    'footer', 'nav', 'main', 'aside', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'form', 'fieldset', 'hr', 'br', 'pre', 'blockquote', 'figure', 'noscript',
+}
+
+# 可以压缩的脚本类型，其余（如模板）原样保留
+JS_TYPES = {'', 'text/javascript', 'application/javascript', 'module'}
+
+# 字符串和注释一起匹配，先出现的一方生效（如注释中的引号、字符串中的 /*）
+CSS_TOKEN_PATTERN = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|/\*.*?\*/)', re.DOTALL)
+CSS_PUNCTUATION_SPACE = re.compile(f'[{SPACE_CHARS}]*([{{}};,>])[{SPACE_CHARS}]*')
+
+JS_WORD_PATTERN = re.compile(r'[\w$]+')
+
+# 这些关键字之后出现的 / 是正则表达式字面量的开始
+JS_REGEX_KEYWORDS = {
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'case', 'do', 'else', 'yield', 'await',
+}
+
+# 这些语句的条件括号之后出现的 / 是正则表达式，如 if (x) /a/.test(s)
+JS_CONTROL_KEYWORDS = {'if', 'while', 'for', 'with'}
+
+
+class AmbiguousScript(Exception):
+    """无法可靠地切分脚本（如无法判断 / 是除号还是正则），放弃压缩"""
+
+
+def minify_css(css):
+    """压缩CSS：去注释、合并空白，字符串原样保留"""
+    # 注释替换为空格，避免两侧的词法单元粘连
+    parts = CSS_TOKEN_PATTERN.split(css)
+    for i in range(1, len(parts), 2):
+        if parts[i].startswith('/*'):
+            parts[i] = ' '
+
+    parts = CSS_TOKEN_PATTERN.split(''.join(parts))
+    for i in range(0, len(parts), 2):
+        code = WHITESPACE_PATTERN.sub(' ', parts[i])
+        code = CSS_PUNCTUATION_SPACE.sub(r'\1', code)
+        parts[i] = code.replace(';}', '}')
+    return ''.join(parts).strip(SPACE_CHARS)
+
+
+def scan_js_string(js, i):
+    """返回从 i 开始的字符串字面量的结束位置"""
+    quote = js[i]
+    j = i + 1
+    while j < len(js):
+        if js[j] == '\\':
+            j += 2
+        elif js[j] == quote:
+            return j + 1
+        elif js[j] == '\n':
+            break
+        else:
+            j += 1
+    raise AmbiguousScript('未闭合的字符串')
+
+
+def scan_js_template(js, i):
+    """返回从 i 开始的模板字符串的结束位置，${} 中的表达式（含嵌套模板）原样跳过"""
+    j = i + 1
+    while j < len(js):
+        if js[j] == '\\':
+            j += 2
+        elif js[j] == '`':
+            return j + 1
+        elif js.startswith('${', j):
+            j = scan_js_template_expression(js, j + 2)
+        else:
+            j += 1
+    raise AmbiguousScript('未闭合的模板字符串')
+
+
+def scan_js_template_expression(js, i):
+    """返回 ${...} 表达式结束（右花括号之后）的位置"""
+    depth = 1
+    j = i
+    while j < len(js):
+        ch = js[j]
+        if ch in '"\'':
+            j = scan_js_string(js, j)
+        elif ch == '`':
+            j = scan_js_template(js, j)
+        elif ch == '/':
+            # 表达式内的注释、正则和除号不做区分，直接放弃
+            raise AmbiguousScript('模板表达式中包含 /')
+        elif ch == '{':
+            depth += 1
+            j += 1
+        elif ch == '}':
+            depth -= 1
+            j += 1
+            if depth == 0:
+                return j
+        else:
+            j += 1
+    raise AmbiguousScript('未闭合的模板表达式')
+
+
+def scan_js_regex(js, i):
+    """返回从 i 开始的正则表达式字面量（含修饰符）的结束位置"""
+    j = i + 1
+    in_class = False
+    while j < len(js) and js[j] != '\n':
+        if js[j] == '\\':
+            j += 2
+            continue
+        if js[j] == '[':
+            in_class = True
+        elif js[j] == ']':
+            in_class = False
+        elif js[j] == '/' and not in_class:
+            match = JS_WORD_PATTERN.match(js, j + 1)
+            return match.end() if match else j + 1
+        j += 1
+    raise AmbiguousScript('未闭合的正则表达式')
+
+
+def minify_js(js):
+    """保守地压缩JS：去注释、合并空白，保留换行以免破坏自动分号插入；
+    无法可靠切分的脚本原样返回"""
+    try:
+        return _minify_js(js)
+    except AmbiguousScript:
+        return js
+
+
+def _minify_js(js):
+    out = []
+    i = 0
+    n = len(js)
+    # 上一个词法单元决定后面的 / 是正则还是除号：
+    # 'regex' 表示其后是正则，'division' 表示其后是除号，'ambiguous' 表示无法判断
+    prev = 'regex'
+    prev_punct = ''
+    parens = []  # 每层括号是否为 if/while/for/with 的条件
+
+    def add_space(space):
+        # 连续空白只保留一个，含换行时保留换行
+        if out and out[-1] in (' ', '\n'):
+            if space == '\n':
+                out[-1] = '\n'
+        elif out:
+            out.append(space)
+
+    while i < n:
+        ch = js[i]
+
+        if ch in '"\'':
+            j = scan_js_string(js, i)
+            out.append(js[i:j])
+            prev = 'division'
+            prev_punct = ''
+        elif ch == '`':
+            j = scan_js_template(js, i)
+            out.append(js[i:j])
+            prev = 'division'
+            prev_punct = ''
+        elif js.startswith('//', i):
+            j = js.find('\n', i)
+            j = n if j == -1 else j
+        elif js.startswith('/*', i):
+            j = js.find('*/', i + 2)
+            if j == -1:
+                raise AmbiguousScript('未闭合的注释')
+            j += 2
+            # 注释两侧的词法单元不能粘连
+            add_space('\n' if '\n' in js[i:j] else ' ')
+        elif ch == '/':
+            if prev == 'ambiguous':
+                raise AmbiguousScript('无法判断 / 是除号还是正则')
+            if prev == 'regex':
+                j = scan_js_regex(js, i)
+                out.append(js[i:j])
+                prev = 'division'
+            else:
+                j = i + 1
+                out.append(ch)
+                prev = 'regex'
+            prev_punct = ''
+        elif ch.isspace():
+            j = i
+            while j < n and js[j].isspace():
+                j += 1
+            add_space('\n' if '\n' in js[i:j] else ' ')
+        elif JS_WORD_PATTERN.match(js, i):
+            j = JS_WORD_PATTERN.match(js, i).end()
+            word = js[i:j]
+            out.append(word)
+            # obj.return 这样的属性名不是关键字
+            if prev_punct == '.':
+                prev = 'division'
+            elif word in JS_REGEX_KEYWORDS:
+                prev = 'regex'
+            elif word in JS_CONTROL_KEYWORDS:
+                prev = 'control'
+            else:
+                prev = 'division'
+            prev_punct = ''
+        else:
+            j = i + 1
+            if js.startswith('++', i) or js.startswith('--', i):
+                # 前置还是后置自增无法简单判断
+                j = i + 2
+                prev = 'ambiguous'
+            elif ch == '(':
+                parens.append(prev == 'control')
+                prev = 'regex'
+            elif ch == ')':
+                prev = 'regex' if parens and parens.pop() else 'division'
+            elif ch == ']':
+                prev = 'division'
+            elif ch == '}':
+                # 代码块结束后是正则，对象字面量结束后是除号
+                prev = 'ambiguous'
+            else:
+                prev = 'regex'
+            out.append(js[i:j])
+            prev_punct = js[i:j]
+        i = j
+
+    return ''.join(out).strip()
+
+
+def script_type(open_tag):
+    """取得 <script> 标签的 type 属性（小写）"""
+    match = re.search(r'\btype\s*=\s*["\']?([^"\'\s>]*)', open_tag, re.IGNORECASE)
+    return match.group(1).lower() if match else ''
+
+
+def minify_html(html):
+    """压缩HTML及其内联 <style>/<script>，去除注释；<pre>/<textarea> 内容保持不变"""
+    # 依次为 (类型, 内容, 标签名)，类型为 text 或 tag；原样保留的元素整体作为一个 tag
+    tokens = []
+    pos = 0
+    while True:
+        match = HTML_TOKEN_PATTERN.search(html, pos)
+        if not match:
+            tokens.append(('text', html[pos:], ''))
+            break
+        tokens.append(('text', html[pos:match.start()], ''))
+        token = match.group()
+        pos = match.end()
+
+        if token.startswith('<!--'):
+            # 条件注释（<!--[if IE]>）需要保留
+            if token.startswith('<!--[if'):
+                tokens.append(('tag', token, ''))
+            continue
+
+        name_match = TAG_NAME_PATTERN.match(token)
+        name = name_match.group(1).lower() if name_match else ''
+        if name in RAW_TAGS and not token.startswith('</'):
+            # 原始文本元素的内容一直到对应的结束标签为止，其中的 <!-- 和标签都不解析
+            close = re.compile(f'</{name}[{SPACE_CHARS}]*>', re.IGNORECASE).search(html, pos)
+            content_end = close.start() if close else len(html)
+            close_tag = close.group() if close else ''
+            content = html[pos:content_end]
+            if close and name == 'style':
+                content = minify_css(content)
+            elif close and name == 'script' and script_type(token) in JS_TYPES:
+                content = minify_js(content)
+            tokens.append(('tag', token + content + close_tag, name))
+            pos = close.end() if close else len(html)
+        else:
+            tokens.append(('tag', token, name))
+
+    # 合并删除注释后相邻的文本
+    merged = []
+    for token in tokens:
+        if token[0] == 'text' and merged and merged[-1][0] == 'text':
+            merged[-1] = ('text', merged[-1][1] + token[1], '')
+        else:
+            merged.append(token)
+
+    # 标签原样保留（避免改动属性值），只压缩文本中的空白
+    parts = []
+    for i, (kind, content, name) in enumerate(merged):
+        if kind == 'text':
+            content = WHITESPACE_PATTERN.sub(' ', content)
+            if content == ' ':
+                prev_tag = merged[i - 1][2] if i > 0 else ''
+                next_tag = merged[i + 1][2] if i + 1 < len(merged) else ''
+                if i == 0 or i == len(merged) - 1 or prev_tag in BLOCK_TAGS or next_tag in BLOCK_TAGS:
+                    content = ''
+        parts.append(content)
+
+    return ''.join(parts).strip(SPACE_CHARS)
@@ -0,0 +1,71 @@
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+class DummyTimer:
+    """替代 threading.Timer，测试中不启动后台定时器"""
+
+    def __init__(self, *args, **kwargs):
+        self.daemon = False
+
+    def start(self):
+        pass
+
+
+@pytest.fixture
+def app_module(tmp_path, monkeypatch):
+    """使用临时数据库和上传目录的 app 模块；任务不进线程池，由测试同步执行"""
+    pytest.importorskip('flask')
+    # app 导入时会在当前目录创建 uploads，避免落在仓库里
+    monkeypatch.chdir(tmp_path)
+    import app as app_module
+
+    upload_folder = tmp_path / 'uploads'
+    upload_folder.mkdir(exist_ok=True)
+    monkeypatch.setattr(app_module, 'DATABASE', str(tmp_path / 'tools.db'))
+    monkeypatch.setitem(app_module.app.config, 'UPLOAD_FOLDER', str(upload_folder))
+    monkeypatch.setitem(app_module.app.config, 'EXPORT_FOLDER', str(tmp_path / 'static_export'))
+    monkeypatch.setitem(app_module.app.config, 'OPTIMIZE_UPLOADS', True)
+    monkeypatch.setattr(app_module, 'job_workers_started', False)
+    monkeypatch.setattr(app_module.threading, 'Timer', DummyTimer)
+
+    dispatched = []
+    monkeypatch.setattr(app_module, 'dispatch_job', lambda job_id, delay=0: dispatched.append((job_id, delay)))
+    monkeypatch.setattr(app_module, 'dispatched_jobs', dispatched, raising=False)
+
+    app_module.init_db()
+    conn = app_module.get_db_connection()
+    for name, display_name in [('all', '全部'), ('image', '图片工具'), ('pdf', 'PDF转换工具')]:
+        conn.execute('INSERT INTO categories (name, display_name) VALUES (?, ?)', (name, display_name))
+    conn.commit()
+    conn.close()
+    return app_module
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+def upload(client, path_name, html, title='组件', category_id='2'):
+    """上传一个组件，返回响应JSON"""
+    response = client.post('/api/upload', data={
+        'file': (io.BytesIO(html.encode('utf-8')), f'{path_name}.html'),
+        'title': title,
+        'path_name': path_name,
+        'category_id': category_id,
+    })
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def run_dispatched_jobs(app_module):
+    """同步执行所有已派发的任务（包括执行中新派发的重试）"""
+    while app_module.dispatched_jobs:
+        job_id, _ = app_module.dispatched_jobs.pop(0)
+        app_module.run_job(job_id)
@@ -0,0 +1,224 @@
+import json
+import os
+
+from conftest import run_dispatched_jobs, upload
+
+
+def export_dir(app_module):
+    return app_module.app.config['EXPORT_FOLDER']
+
+
+def read_json(app_module, rel_path):
+    with open(os.path.join(export_dir(app_module), rel_path), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def exists(app_module, rel_path):
+    return os.path.exists(os.path.join(export_dir(app_module), rel_path))
+
+
+def create_tool(client, title, category_id=2):
+    response = client.post('/api/preset-tools', json={
+        'title': title, 'description': f'{title}的描述', 'category_id': category_id,
+    })
+    return response.get_json()['tool']['id']
+
+
+def test_full_export_matches_api(app_module, client):
+    create_tool(client, '图片压缩器', 2)
+    create_tool(client, 'PDF合并', 3)
+
+    result = app_module.export_static(export_dir(app_module))
+
+    assert result['full']
+    assert read_json(app_module, 'categories.json') == client.get('/api/categories').get_json()
+    for category_id in ('0', '1', '2', '3'):
+        assert read_json(app_module, f'tools/{category_id}/page-1.json') == \
+            client.get(f'/api/tools?category_id={category_id}&page=1').get_json()
+
+    manifest = read_json(app_module, 'manifest.json')
+    assert manifest['tools']['0'] == ['tools/0/page-1.json']
+    assert manifest['missing_components'] == []
+
+
+def test_uploaded_component_links_to_hashed_file(app_module, client):
+    upload(client, 'qrcode', '<html>\n  <body>  二维码  </body>\n</html>')
+    run_dispatched_jobs(app_module)
+
+    app_module.export_static(export_dir(app_module))
+
+    manifest = read_json(app_module, 'manifest.json')
+    entry = list(manifest['components'].values())[0]
+    assert entry['path_name'] == 'qrcode'
+    assert entry['file'].startswith('components/qrcode.') and entry['file'].endswith('.html')
+    # 导出的是压缩版本
+    with open(os.path.join(export_dir(app_module), entry['file']), encoding='utf-8') as f:
+        assert f.read() == '<html><body> 二维码 </body></html>'
+
+    tools = read_json(app_module, 'tools/2/page-1.json')['tools']
+    assert [tool['url'] for tool in tools] == [entry['file']]
+
+
+def test_incremental_export_only_rewrites_dirty_shards(app_module, client):
+    create_tool(client, '图片压缩器', 2)
+    create_tool(client, 'PDF合并', 3)
+    app_module.export_static(export_dir(app_module))
+
+    # 未受影响的分片不应被重写
+    untouched = os.path.join(export_dir(app_module), 'tools/3/page-1.json')
+    with open(untouched, 'w') as f:
+        f.write('sentinel')
+
+    create_tool(client, '图片格式转换', 2)
+    result = app_module.export_static(export_dir(app_module))
+
+    assert not result['full']
+    with open(untouched) as f:
+        assert f.read() == 'sentinel'
+    assert read_json(app_module, 'tools/2/page-1.json')['pagination']['total'] == 2
+    assert read_json(app_module, 'tools/0/page-1.json')['pagination']['total'] == 3
+
+
+def test_incremental_export_without_changes_writes_nothing(app_module, client):
+    create_tool(client, '图片压缩器', 2)
+    app_module.export_static(export_dir(app_module))
+
+    result = app_module.export_static(export_dir(app_module))
+    assert not result['full']
+    assert (result['written'], result['removed']) == (0, 0)
+
+
+def test_tool_moved_between_categories_updates_both(app_module, client):
+    tool_id = create_tool(client, '图片压缩器', 2)
+    app_module.export_static(export_dir(app_module))
+
+    client.put(f'/api/preset-tools/{tool_id}', json={'title': '图片压缩器', 'description': '描述', 'category_id': 3})
+    app_module.export_static(export_dir(app_module))
+
+    assert read_json(app_module, 'tools/2/page-1.json')['tools'] == []
+    assert [tool['id'] for tool in read_json(app_module, 'tools/3/page-1.json')['tools']] == [tool_id]
+
+
+def test_page_count_shrink_removes_stale_pages(app_module, client):
+    tool_ids = [create_tool(client, f'工具{i}', 2) for i in range(app_module.EXPORT_PER_PAGE + 1)]
+    app_module.export_static(export_dir(app_module))
+    assert exists(app_module, 'tools/2/page-2.json')
+
+    client.delete(f'/api/preset-tools/{tool_ids[0]}')
+    result = app_module.export_static(export_dir(app_module))
+
+    assert result['removed'] == 2  # 分类2和“全部”各少一页
+    assert not exists(app_module, 'tools/2/page-2.json')
+    assert not exists(app_module, 'tools/0/page-2.json')
+    assert read_json(app_module, 'manifest.json')['tools']['2'] == ['tools/2/page-1.json']
+
+
+def test_deleted_category_removes_its_shards(app_module, client):
+    response = client.post('/api/categories', json={'name': 'temp', 'display_name': '临时'})
+    category_id = response.get_json()['category']['id']
+    app_module.export_static(export_dir(app_module))
+    assert exists(app_module, f'tools/{category_id}/page-1.json')
+
+    client.delete(f'/api/categories/{category_id}')
+    app_module.export_static(export_dir(app_module))
+
+    assert not exists(app_module, f'tools/{category_id}/page-1.json')
+    assert str(category_id) not in read_json(app_module, 'manifest.json')['tools']
+    assert category_id not in [c['id'] for c in read_json(app_module, 'categories.json')]
+
+
+def test_deleted_component_removes_hashed_file(app_module, client):
+    component_id = upload(client, 'qrcode', '<html><body>二维码</body></html>')['component_id']
+    app_module.export_static(export_dir(app_module))
+    hashed_file = read_json(app_module, 'manifest.json')['components'][str(component_id)]['file']
+    assert exists(app_module, hashed_file)
+
+    client.delete(f'/api/uploaded-components/{component_id}')
+    result = app_module.export_static(export_dir(app_module))
+
+    assert not result['full']
+    assert not exists(app_module, hashed_file)
+    assert read_json(app_module, 'manifest.json')['components'] == {}
+    assert read_json(app_module, 'tools/0/page-1.json')['tools'] == []
+
+
+def test_component_with_missing_file_is_reported(app_module, client):
+    upload(client, 'qrcode', '<html><body>二维码</body></html>')
+    upload(client, 'lost', '<html><body>丢失</body></html>')
+    os.remove(os.path.join(app_module.app.config['UPLOAD_FOLDER'], 'lost.html'))
+
+    result = app_module.export_static(export_dir(app_module))
+
+    assert result['missing_components'] == ['lost']
+    assert read_json(app_module, 'manifest.json')['missing_components'] == ['lost']
+    urls = [tool['url'] for tool in read_json(app_module, 'tools/0/page-1.json')['tools']]
+    assert len(urls) == 1 and urls[0].startswith('components/qrcode.')
+
+
+def test_change_log_is_pruned_after_export(app_module, client):
+    create_tool(client, '图片压缩器', 2)
+    create_tool(client, '图片格式转换', 2)
+    result = app_module.export_static(export_dir(app_module))
+
+    conn = app_module.get_db_connection()
+    rows = [row['id'] for row in conn.execute('SELECT id FROM change_log').fetchall()]
+    conn.close()
+    assert rows == [result['last_change_id']]
+
+
+def test_pruned_change_log_forces_full_export(app_module, client):
+    create_tool(client, '图片压缩器', 2)
+    app_module.export_static(export_dir(app_module))
+
+    # 清单记录的变更已被清理（例如另一个导出目录的导出）
+    conn = app_module.get_db_connection()
+    conn.execute('DELETE FROM change_log')
+    conn.commit()
+    conn.close()
+    create_tool(client, 'PDF合并', 3)
+
+    result = app_module.export_static(export_dir(app_module))
+    assert result['full']
+    assert read_json(app_module, 'tools/3/page-1.json')['pagination']['total'] == 1
+
+
+def test_reset_change_log_forces_full_export(app_module, client):
+    for i in range(3):
+        create_tool(client, f'工具{i}', 2)
+    app_module.export_static(export_dir(app_module))
+
+    # 数据库重建后编号重新开始，清单中的 last_change_id 比日志中的都大
+    conn = app_module.get_db_connection()
+    conn.execute('DELETE FROM change_log')
+    conn.execute("DELETE FROM sqlite_sequence WHERE name = 'change_log'")
+    conn.commit()
+    conn.close()
+    create_tool(client, 'PDF合并', 3)
+
+    result = app_module.export_static(export_dir(app_module))
+    assert result['full']
+    assert read_json(app_module, 'tools/0/page-1.json')['pagination']['total'] == 4
+
+
+def test_export_endpoint(app_module, client):
+    create_tool(client, '图片压缩器', 2)
+
+    data = client.post('/api/export?full=1').get_json()
+    assert data['success'] and data['full']
+    assert exists(app_module, 'manifest.json')
+
+    data = client.post('/api/export').get_json()
+    assert data['success'] and not data['full']
+
+
+def test_export_cli_command(app_module, client, tmp_path):
+    create_tool(client, '图片压缩器', 2)
+    output = tmp_path / 'cli_export'
+
+    runner = app_module.app.test_cli_runner()
+    result = runner.invoke(args=['export-static', '--output', str(output), '--full'])
+
+    assert result.exit_code == 0, result.output
+    assert '导出完成' in result.output
+    with open(output / 'tools' / '2' / 'page-1.json', encoding='utf-8') as f:
+        assert json.load(f)['tools'][0]['name'] == '图片压缩器'
@@ -0,0 +1,181 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from html_minify import minify_css, minify_html, minify_js
+
+
+# ==================== minify_js ====================
+
+def test_js_strips_comments_and_collapses_spaces():
+    js = '  var a  =  1; // 注释\n  /* 块注释 */ var b = 2;\n'
+    assert minify_js(js) == 'var a = 1;\nvar b = 2;'
+
+
+def test_js_keeps_comment_markers_inside_strings():
+    js = 'var url = "http://example.com/*x*/";  var s = \'//\';'
+    assert minify_js(js) == 'var url = "http://example.com/*x*/"; var s = \'//\';'
+
+
+def test_js_regex_after_keyword():
+    js = 'function f(s) {\n  return /https?:\\/\\//.test(s) && ok();\n}'
+    assert minify_js(js) == 'function f(s) {\nreturn /https?:\\/\\//.test(s) && ok();\n}'
+
+
+def test_js_regex_whitespace_is_preserved():
+    assert minify_js('x = typeof /a  b/;') == 'x = typeof /a  b/;'
+    assert minify_js('switch (s) { case /a  b/: break }') == 'switch (s) { case /a  b/: break }'
+
+
+def test_js_regex_after_punctuator_and_in_class():
+    js = 'var re = /[/]  x/g,  m = s.match( /a\\/  b/ );'
+    assert minify_js(js) == 'var re = /[/]  x/g, m = s.match( /a\\/  b/ );'
+
+
+def test_js_regex_after_control_condition():
+    js = 'if (ok)   /a  b/.test(s);'
+    assert minify_js(js) == 'if (ok) /a  b/.test(s);'
+
+
+def test_js_division_is_not_regex():
+    js = 'var d = a  /  b / 2,  e = (a + b)  /  2, f = arr[0] / 3;'
+    assert minify_js(js) == 'var d = a / b / 2, e = (a + b) / 2, f = arr[0] / 3;'
+
+
+def test_js_keyword_as_property_is_not_keyword():
+    assert minify_js('x = obj.return  / 2 / 1;') == 'x = obj.return / 2 / 1;'
+
+
+def test_js_ambiguous_slash_leaves_script_unchanged():
+    # } 之后的 / 可能是除号也可能是正则
+    js = 'var o = {}\n/a  b/g.test(s)'
+    assert minify_js(js) == js
+    js = 'i++  /  2'
+    assert minify_js(js) == js
+
+
+def test_js_template_strings_are_preserved():
+    js = 'var t = `多  行\n    ${ a  +  `嵌套  ${b}` }  // 不是注释`;'
+    assert minify_js(js) == js.strip()
+
+
+def test_js_template_expression_with_slash_leaves_script_unchanged():
+    js = 'var t  =  `${a / b}`;'
+    assert minify_js(js) == js
+
+
+def test_js_unterminated_literal_leaves_script_unchanged():
+    for js in ('var s = "abc\n;', 'var r = /abc\n;', 'var t = `abc', 'a /* b'):
+        assert minify_js(js) == js
+
+
+def test_js_newlines_are_kept_for_asi():
+    js = 'var a = 1\n\n   var b = a\n  ++c\nreturn\n  x'
+    assert minify_js(js) == 'var a = 1\nvar b = a\n++c\nreturn\nx'
+
+
+def test_js_comment_with_newline_keeps_line_break():
+    assert minify_js('a = b /* x\n y */ c()') == 'a = b\nc()'
+    assert minify_js('a = b // x\nc()') == 'a = b\nc()'
+
+
+# ==================== minify_css ====================
+
+def test_css_basic():
+    css = '\n/* 注释 */\nbody {  color : red ;  margin: 0 ; }\na:hover , div > p { }\n'
+    assert minify_css(css) == 'body{color : red;margin: 0}a:hover,div>p{}'
+
+
+def test_css_strings_are_preserved():
+    css = 'a { content: ";}" ; }  b { content: \'a , b\'; }'
+    assert minify_css(css) == 'a{content: ";}"}b{content: \'a , b\'}'
+
+
+def test_css_comment_delimiters_inside_strings():
+    assert minify_css('a { content: "/* x */"; }') == 'a{content: "/* x */"}'
+    assert minify_css("/* it's */ a { }") == 'a{}'
+
+
+def test_css_comment_between_tokens_keeps_separator():
+    assert minify_css('.a/**/.b{}') == '.a .b{}'
+
+
+# ==================== minify_html ====================
+
+def test_html_strips_comments_and_collapses_whitespace():
+    html = '<!DOCTYPE html>\n<html>\n  <head>\n    <!-- 注释 -->\n    <title>标题</title>\n  </head>\n' \
+           '  <body>\n    <span>a</span>   <span>b</span>\n  </body>\n</html>\n'
+    assert minify_html(html) == \
+        '<!DOCTYPE html><html><head><title>标题</title></head><body><span>a</span> <span>b</span></body></html>'
+
+
+def test_html_keeps_conditional_comments():
+    html = '<!--[if IE]><p>IE</p><![endif]-->'
+    assert minify_html(html) == html
+
+
+def test_html_attribute_values_are_preserved():
+    html = '<a title="a > b  c"  href=\'x  y\'>链接</a>'
+    assert minify_html(html) == html
+
+
+def test_html_pre_and_textarea_are_preserved():
+    html = '<pre>\n  a   b\n</pre>\n<textarea>  x\n  y</textarea>'
+    assert minify_html(html) == '<pre>\n  a   b\n</pre><textarea>  x\n  y</textarea>'
+
+
+def test_html_minifies_inline_style_and_script():
+    html = '<style>\n  a { color: red; }\n</style>\n<script>\n  // 注释\n  var a  =  1;\n</script>'
+    assert minify_html(html) == '<style>a{color: red}</style><script>var a = 1;</script>'
+
+
+def test_html_script_tag_with_gt_in_attribute():
+    html = '<script data-x="a>b">var a  =  1;</script>'
+    assert minify_html(html) == '<script data-x="a>b">var a = 1;</script>'
+
+
+def test_html_non_js_script_is_preserved():
+    html = '<script type="text/template"><div>  x  </div></script>'
+    assert minify_html(html) == html
+
+
+def test_html_keeps_non_breaking_and_ideographic_spaces():
+    # \xa0 和全角空格 　 会被渲染，不属于HTML空白
+    assert minify_html('<p>a  b\xa0\xa0c</p>') == '<p>a b\xa0\xa0c</p>'
+    assert minify_html('<p>中文　　缩进</p>') == '<p>中文　　缩进</p>'
+    assert minify_html('<div>　</div>') == '<div>　</div>'
+    assert minify_html('　<p>x</p>\xa0') == '　<p>x</p>\xa0'
+
+
+def test_css_keeps_non_breaking_and_ideographic_spaces():
+    assert minify_css('a { content: "x" }　') == 'a{content: "x"}　'
+    assert minify_css('a\xa0{ }') == 'a\xa0{}'
+
+
+def test_html_commented_out_raw_tag_is_not_paired():
+    html = '<!-- <style> disabled --><p>x > y</p><style>a { color: red }</style>'
+    assert minify_html(html) == '<p>x > y</p><style>a{color: red}</style>'
+
+
+def test_html_comment_markers_inside_attribute_are_kept():
+    html = '<div title="<!-- x -->">a</div>'
+    assert minify_html(html) == html
+
+
+def test_html_comment_markers_inside_script_are_kept():
+    html = '<script>var a = "<!-- x -->";</script>'
+    assert minify_html(html) == html
+
+
+def test_html_removed_comment_joins_surrounding_text():
+    assert minify_html('<span>a</span><!-- x -->  <span>b</span>') == '<span>a</span> <span>b</span>'
+
+
+def test_html_custom_element_is_not_raw_tag():
+    assert minify_html('<pre-x>  a  </pre-x>') == '<pre-x> a </pre-x>'
+
+
+def test_html_unclosed_raw_tag_keeps_rest_unchanged():
+    html = '<p>a</p><style>a  {  }'
+    assert minify_html(html) == html
@@ -0,0 +1,242 @@
+import os
+import sqlite3
+
+from conftest import run_dispatched_jobs, upload
+
+HTML = '''<!DOCTYPE html>
+<html>
+  <head>
+    <title>  二维码生成器  </title>
+    <meta name="description" content="在线生成二维码">
+  </head>
+  <body>
+    <p>  内容  </p>
+  </body>
+</html>
+'''
+
+
+def query(app_module, sql, params=()):
+    conn = app_module.get_db_connection()
+    rows = [dict(row) for row in conn.execute(sql, params).fetchall()]
+    conn.close()
+    return rows
+
+
+def test_upload_enqueues_jobs_and_returns_pending(app_module, client):
+    result = upload(client, 'qrcode', HTML)
+
+    assert result['process_status'] == 'pending'
+    jobs = query(app_module, 'SELECT id, job_type, status FROM jobs ORDER BY id')
+    assert [(job['job_type'], job['status']) for job in jobs] == [('process', 'pending'), ('optimize', 'pending')]
+    assert [job_id for job_id, _ in app_module.dispatched_jobs] == [job['id'] for job in jobs]
+
+
+def test_jobs_fill_derived_columns_and_status(app_module, client):
+    component_id = upload(client, 'qrcode', HTML)['component_id']
+    run_dispatched_jobs(app_module)
+
+    status = client.get(f'/api/uploaded-components/{component_id}/status').get_json()
+    assert status['process_status'] == 'done'
+    assert status['processed_at']
+    assert status['description'] == '在线生成二维码'
+    assert status['file_size'] == len(HTML.encode('utf-8'))
+    assert len(status['file_hash']) == 64
+    assert status['optimized_file_name'] == 'qrcode.min.html'
+    assert status['optimized_size'] < status['original_size']
+    assert [(job['job_type'], job['status'], job['attempts']) for job in status['jobs']] == \
+        [('process', 'done', 1), ('optimize', 'done', 1)]
+
+
+def test_status_of_missing_component(client):
+    assert client.get('/api/uploaded-components/999/status').status_code == 404
+
+
+def test_description_falls_back_to_title_tag(app_module, client):
+    upload(client, 'notitle', '<html><head><title> 单位换算 </title></head></html>', title='换算')
+    run_dispatched_jobs(app_module)
+
+    rows = query(app_module, 'SELECT description FROM uploaded_components')
+    assert rows == [{'description': '单位换算'}]
+
+
+def test_description_feeds_tools_search(app_module, client):
+    upload(client, 'qrcode', HTML, title='组件A')
+
+    # 处理完成前只能按标题搜索
+    assert client.get('/api/tools?search=生成二维码').get_json()['pagination']['total'] == 0
+
+    run_dispatched_jobs(app_module)
+    tools = client.get('/api/tools?search=生成二维码').get_json()['tools']
+    assert [(tool['name'], tool['description']) for tool in tools] == [('组件A', '在线生成二维码')]
+
+
+def test_failed_job_is_retried_then_marked_failed(app_module, client):
+    component_id = upload(client, 'qrcode', HTML)['component_id']
+    os.remove(os.path.join(app_module.app.config['UPLOAD_FOLDER'], 'qrcode.html'))
+    process_job_id = app_module.dispatched_jobs[0][0]
+    app_module.dispatched_jobs.clear()
+
+    for attempt in range(1, app_module.JOB_MAX_ATTEMPTS):
+        app_module.run_job(process_job_id)
+        job = query(app_module, 'SELECT * FROM jobs WHERE id = ?', (process_job_id,))[0]
+        assert (job['status'], job['attempts']) == ('pending', attempt)
+        assert 'No such file' in job['last_error']
+        # 重试按次数递增延迟
+        assert app_module.dispatched_jobs.pop() == (process_job_id, attempt * app_module.JOB_RETRY_DELAY)
+
+    app_module.run_job(process_job_id)
+    job = query(app_module, 'SELECT * FROM jobs WHERE id = ?', (process_job_id,))[0]
+    assert (job['status'], job['attempts']) == ('failed', app_module.JOB_MAX_ATTEMPTS)
+    assert app_module.dispatched_jobs == []
+
+    status = client.get(f'/api/uploaded-components/{component_id}/status').get_json()
+    assert status['process_status'] == 'failed'
+    assert status['processed_at'] is None
+
+
+def test_successful_rerun_clears_failed_status(app_module, client):
+    component_id = upload(client, 'qrcode', HTML)['component_id']
+    conn = app_module.get_db_connection()
+    conn.execute("UPDATE jobs SET status = 'failed'")
+    conn.commit()
+    job_id = app_module.enqueue_job(conn, 'process', component_id)
+    job_id_optimize = app_module.enqueue_job(conn, 'optimize', component_id)
+    conn.commit()
+    conn.close()
+
+    app_module.run_job(job_id)
+    app_module.run_job(job_id_optimize)
+
+    # 只看每种任务最近一次的执行结果
+    status = client.get(f'/api/uploaded-components/{component_id}/status').get_json()
+    assert status['process_status'] == 'done'
+
+
+def test_job_is_claimed_only_once(app_module, client):
+    upload(client, 'qrcode', HTML)
+    job_id = app_module.dispatched_jobs[0][0]
+
+    app_module.run_job(job_id)
+    app_module.run_job(job_id)
+
+    assert query(app_module, 'SELECT attempts FROM jobs WHERE id = ?', (job_id,)) == [{'attempts': 1}]
+
+
+def insert_job(app_module, component_id, status, attempts, updated_at):
+    conn = app_module.get_db_connection()
+    cursor = conn.execute('''
+        INSERT INTO jobs (job_type, component_id, status, attempts, created_at, updated_at)
+        VALUES ('process', ?, ?, ?, ?, ?)
+    ''', (component_id, status, attempts, updated_at, updated_at))
+    conn.commit()
+    conn.close()
+    return cursor.lastrowid
+
+
+def reclaim(app_module):
+    conn = app_module.get_db_connection()
+    job_ids = app_module.reclaim_stale_jobs(conn)
+    conn.commit()
+    conn.close()
+    return job_ids
+
+
+def test_reclaim_only_stale_jobs(app_module, client):
+    component_id = upload(client, 'qrcode', HTML)['component_id']
+    conn = app_module.get_db_connection()
+    conn.execute('DELETE FROM jobs')
+    conn.commit()
+    conn.close()
+
+    stale_running = insert_job(app_module, component_id, 'running', 1, '2000-01-01 00:00:00')
+    stale_pending = insert_job(app_module, component_id, 'pending', 0, '2000-01-01 00:00:00')
+    live_running = insert_job(app_module, component_id, 'running', 1, app_module.now_str())
+
+    assert reclaim(app_module) == [stale_running, stale_pending]
+    statuses = {row['id']: row['status'] for row in query(app_module, 'SELECT id, status FROM jobs')}
+    assert statuses == {stale_running: 'pending', stale_pending: 'pending', live_running: 'running'}
+
+    # 已回收的任务更新了时间，不会被重复回收
+    assert reclaim(app_module) == []
+
+
+def test_reclaim_fails_job_out_of_attempts(app_module, client):
+    component_id = upload(client, 'qrcode', HTML)['component_id']
+    conn = app_module.get_db_connection()
+    conn.execute('DELETE FROM jobs')
+    conn.commit()
+    conn.close()
+
+    job_id = insert_job(app_module, component_id, 'running', app_module.JOB_MAX_ATTEMPTS, '2000-01-01 00:00:00')
+
+    assert reclaim(app_module) == []
+    job = query(app_module, 'SELECT status, last_error FROM jobs WHERE id = ?', (job_id,))[0]
+    assert job['status'] == 'failed'
+    assert job['last_error']
+    assert query(app_module, 'SELECT process_status FROM uploaded_components') == [{'process_status': 'failed'}]
+
+
+def test_start_backfills_legacy_components(app_module, client):
+    with open(os.path.join(app_module.app.config['UPLOAD_FOLDER'], 'legacy.html'), 'w', encoding='utf-8') as f:
+        f.write(HTML)
+    conn = app_module.get_db_connection()
+    conn.execute('''
+        INSERT INTO uploaded_components (title, path_name, file_name, category_id, upload_date)
+        VALUES ('旧组件', 'legacy', 'legacy.html', 2, '2024-01-01')
+    ''')
+    conn.commit()
+    conn.close()
+
+    client.get('/api/categories')
+    assert app_module.job_workers_started
+    jobs = query(app_module, 'SELECT job_type FROM jobs ORDER BY id')
+    assert [job['job_type'] for job in jobs] == ['process', 'optimize']
+
+    run_dispatched_jobs(app_module)
+    assert query(app_module, 'SELECT description, process_status FROM uploaded_components') == \
+        [{'description': '在线生成二维码', 'process_status': 'done'}]
+
+    # 已有任务的组件不会重复登记
+    app_module.job_workers_started = False
+    client.get('/api/categories')
+    assert len(query(app_module, 'SELECT id FROM jobs')) == 2
+
+
+def test_start_upgrades_old_database(app_module, client, tmp_path):
+    # 引入任务表之前的数据库结构
+    old_db = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(old_db)
+    conn.execute('CREATE TABLE categories (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL UNIQUE, display_name TEXT NOT NULL)')
+    conn.execute('CREATE TABLE tools (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, description TEXT NOT NULL, category_id INTEGER NOT NULL, publish_date TEXT NOT NULL)')
+    conn.execute('CREATE TABLE uploaded_components (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, path_name TEXT NOT NULL UNIQUE, file_name TEXT NOT NULL, category_id INTEGER NOT NULL, upload_date TEXT NOT NULL)')
+    conn.execute("INSERT INTO categories (name, display_name) VALUES ('image', '图片工具')")
+    conn.commit()
+    conn.close()
+    app_module.DATABASE = old_db
+
+    assert client.get('/api/tools?search=x').status_code == 200
+    assert client.get('/api/tools').get_json()['pagination']['total'] == 0
+
+
+def test_optimize_for_deleted_component_leaves_no_file(app_module, client):
+    component_id = upload(client, 'qrcode', HTML)['component_id']
+    conn = app_module.get_db_connection()
+    component = conn.execute('SELECT * FROM uploaded_components WHERE id = ?', (component_id,)).fetchone()
+    # 模拟任务执行期间组件被删除
+    conn.execute('DELETE FROM uploaded_components WHERE id = ?', (component_id,))
+    conn.commit()
+
+    app_module.optimize_component(conn, component)
+    conn.close()
+
+    assert not os.path.exists(os.path.join(app_module.app.config['UPLOAD_FOLDER'], 'qrcode.min.html'))
+
+
+def test_delete_component_removes_jobs_and_files(app_module, client):
+    component_id = upload(client, 'qrcode', HTML)['component_id']
+    run_dispatched_jobs(app_module)
+
+    assert client.delete(f'/api/uploaded-components/{component_id}').get_json()['success']
+    assert query(app_module, 'SELECT id FROM jobs') == []
+    assert os.listdir(app_module.app.config['UPLOAD_FOLDER']) == []